@@ -13,70 +13,55 @@ Date: 2022
 For usage instructions and further details, please refer to the README.md file.
 
 """
-from utils.analysis import section_map
+import re
+import threading
+from utils._geom_numba import warmup
+from utils.analysis import HAVE_NATIVE, section_map
 from utils.plotting import plot_dip_separation, plot_fault_plane, plot_strike_separation
 
-def main():
-    while True:
-        try:
-            fault_dip = float(input("Enter Fault dip (0-90): "))
-            if 0 <= fault_dip <= 90:
-                break
-            else:
-                print("Fault dip must be between 0 and 90. Please try again.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
+# Plain decimal number, checked before calling float()
+_NUM_RE = re.compile(r'^\s*[-+]?(\d+(\.\d*)?|\.\d+)\s*$')
 
-    while True:
-        try:
-            fault_dip_direction = float(input("Enter Fault dip direction (0-360): "))
-            if 0 <= fault_dip_direction <= 360:
-                break
-            else:
-                print("Fault dip direction must be between 0 and 360. Please try again.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
+def read_float(name, lo=None, hi=None, default=None):
+    """
+    Asks for a number until a valid one is entered.
 
-    while True:
-        try:
-            bedding_dip = float(input("Enter Bedding dip (0-90): "))
-            if 0 <= bedding_dip <= 90:
-                break
-            else:
-                print("Bedding dip must be between 0 and 90. Please try again.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
+    Args:
+        name (str): Name of the parameter, shown in the prompt and in the error messages.
+        lo, hi (float): Allowed range, both inclusive. The range is not checked when they are None.
+        default (float): Value returned when the input is empty. Empty input is invalid when it is None.
 
-    while True:
-        try:
-            bedding_dip_direction = float(input("Enter Bedding dip direction (0-360): "))
-            if 0 <= bedding_dip_direction <= 360:
-                break
-            else:
-                print("Bedding dip direction must be between 0 and 360. Please try again.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
+    Returns:
+        float: The number entered, or the default.
+    """
+    if default is None:
+        prompt = f"Enter {name} ({lo}-{hi}): "
+    else:
+        prompt = f"Enter {name} ({default} by default): "
 
     while True:
-        try:
-            pitch_net_slip = float(input("Enter Pitch net slip (0-360): "))
-            if 0 <= pitch_net_slip <= 360:
-                break
-            else:
-                print("Pitch net slip must be between 0 and 360. Please try again.")
-        except ValueError:
+        text = input(prompt)
+        if text == "" and default is not None:
+            return default
+        if not _NUM_RE.match(text):
             print("Invalid input. Please enter a number.")
+        elif lo is not None and not lo <= float(text) <= hi:
+            print(f"{name} must be between {lo} and {hi}. Please try again.")
+        else:
+            return float(text)
 
-    while True:
-        try:
-            units_net_slip = input("Enter Units net slip (10 by default): ")
-            if units_net_slip == "":
-                units_net_slip = 10
-            else:
-                units_net_slip = float(units_net_slip)
-            break
-        except ValueError:
-            print("Invalid input. Please enter a number.")
+def main():
+    # Compile the section and map geometry while the user types the input data, unless it was
+    # compiled ahead of time
+    if not HAVE_NATIVE:
+        threading.Thread(target=warmup, daemon=True).start()
+
+    fault_dip = read_float("Fault dip", 0, 90)
+    fault_dip_direction = read_float("Fault dip direction", 0, 360)
+    bedding_dip = read_float("Bedding dip", 0, 90)
+    bedding_dip_direction = read_float("Bedding dip direction", 0, 360)
+    pitch_net_slip = read_float("Pitch net slip", 0, 360)
+    units_net_slip = read_float("Units net slip", default=10)
 
     print(f"Fault dip: {fault_dip}")
     print(f"Fault dip direction: {fault_dip_direction}")
@@ -101,11 +86,11 @@ def main():
         opcion = input("Select option: ")
 
         if opcion == "1":
-            plot_fault_plane(fault, bedding, net_slip_rake)
+            plot_fault_plane(fault, bedding, net_slip_rake, save_path='fault-plane.png')
         elif opcion == "2":
-           plot_dip_separation(fault, bedding, net_slip_rake)
+           plot_dip_separation(fault, bedding, net_slip_rake, save_path='dip_separation.png')
         elif opcion == "3":
-            plot_strike_separation(fault, bedding, net_slip_rake)
+            plot_strike_separation(fault, bedding, net_slip_rake, save_path='strike_separation.png')
         elif opcion == "4":
             section_map(fault, bedding, net_slip_rake,net_slip_value)
         elif opcion == "5":
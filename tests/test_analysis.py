@@ -0,0 +1,92 @@
+"""
+test_analysis.py
+
+Checks that the batched section_map geometry matches the single scenario one, and that the
+section and map plots show the computed points.
+
+Project: Fault Slip and Separation Explorer Tool
+Author: Marta Magán Lobo
+Date: 2022
+
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from utils import analysis
+from utils._geom_numba import FIELDS
+
+rng = np.random.default_rng(0)
+N = 50
+FAULT_DIP = rng.integers(5, 86, N).astype(float)
+FAULT_DD = rng.integers(0, 360, N).astype(float)
+BEDDING_DIP = rng.integers(5, 86, N).astype(float)
+BEDDING_DD = rng.integers(0, 360, N).astype(float)
+# Keep the bedding away from the degenerate orientations parallel or normal to the fault
+BEDDING_DD = np.where((BEDDING_DD - FAULT_DD) % 90 == 0, BEDDING_DD + 1, BEDDING_DD)
+RAKE = rng.integers(1, 359, N).astype(float)
+VALUE = rng.integers(1, 20, N).astype(float)
+
+# (fault_dip, fault_dd, bedding_dip, bedding_dd, net_slip_rake, net_slip_value)
+CASES = {
+    'all arrays': (FAULT_DIP, FAULT_DD, BEDDING_DIP, BEDDING_DD, RAKE, VALUE),
+    'only rake': (30.0, 45.0, 10.0, 120.0, np.arange(0, 360, 30, dtype=float), 10.0),
+    'fault and rake': (np.array([30.0, 60.0]), 45.0, 10.0, 120.0, np.array([40.0, 250.0]), 10.0),
+}
+
+BACKENDS = ['arrays']
+if analysis.HAVE_NUMBA:
+    BACKENDS.append('batched')
+
+
+def _batched(backend, inputs):
+    inputs = tuple(np.asarray(a, dtype=float) for a in inputs)
+    if backend == 'batched':
+        return analysis._section_map_batched(*inputs)
+    with np.errstate(all='ignore'):
+        return analysis._section_map_arrays(*inputs)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('case', CASES)
+def test_batched_matches_scalar(backend, case):
+    inputs = CASES[case]
+    shape = np.broadcast_shapes(*(np.shape(a) for a in inputs))
+    geometry = dict(zip(FIELDS, _batched(backend, inputs)))
+
+    for n in range(shape[0]):
+        row = [float(np.broadcast_to(a, shape)[n]) for a in inputs]
+        expected = analysis._section_map_scalar(*row).reshape(-1, 2)
+        for name, value in zip(FIELDS, expected):
+            np.testing.assert_allclose(geometry[name][n], value, rtol=1e-7, atol=1e-9,
+                                       err_msg=f'{name}, scenario {n}')
+
+
+def test_section_map_mixed_inputs():
+    results = analysis.section_map((30, 45), (10, 120), np.arange(0, 360, 30), 10)
+
+    assert results['fw'].shape == (12, 2)
+    assert results['dip_separation'].shape == (12,)
+    assert results['strike_separation'].shape == (12,)
+
+
+@pytest.mark.parametrize('reuse', (False, True))
+def test_plot_section_map_limits(monkeypatch, tmp_path, reuse):
+    # plot_section_map saves map-section.png in the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(plt, 'show', lambda: None)
+    plt.close('all')
+    if reuse:
+        # Draw a scenario with narrower limits first, so that the figure is updated in place
+        analysis.section_map((50, 156), (10, 28), 40, 10)
+
+    # The hangingwall point in map, about (-81.5, 29.7), lies beyond the plotted lines
+    results = analysis.section_map((30, 200), (50, 10), 250, 12)
+    analysis.plot_section_map(results)
+
+    artists = analysis._SECTION_MAP_ARTISTS
+    for ax, point in ((artists['ax1'], results['hw']), (artists['ax2'], results['hwm'])):
+        xmin, xmax = ax.get_xlim()
+        ymin, ymax = ax.get_ylim()
+        assert xmin <= point[0] <= xmax and ymin <= point[1] <= ymax
+    plt.close('all')
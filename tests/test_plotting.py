@@ -0,0 +1,53 @@
+"""
+test_plotting.py
+
+Checks the fault plane plot at the limiting cut-off pitches and net slip rakes.
+
+Project: Fault Slip and Separation Explorer Tool
+Author: Marta Magán Lobo
+Date: 2022
+
+"""
+
+import numpy as np
+import pytest
+from matplotlib.collections import LineCollection
+from utils.plotting import _unit, cutoff_pitch, plot_fault_plane
+
+# Fault and bedding planes (dip, dip direction) whose cut-off line has the given pitch. cutoff_pitch
+# returns values in [0, 180), so a pitch of 180 is only checked through _unit.
+PLANES = {
+    0: ((60, 90), (30, 90)),
+    90: ((60, 90), (90, 0)),
+}
+
+UNIT = {
+    0: (1, 0),
+    90: (0, -1),
+    180: (-1, 0),
+    360: (1, 0),
+}
+
+
+@pytest.mark.parametrize('angle', (0, 90, 180, 360))
+def test_unit(angle):
+    np.testing.assert_allclose(_unit(angle), UNIT[angle], atol=1e-12)
+
+
+@pytest.mark.parametrize('rake', (0, 180, 360))
+@pytest.mark.parametrize('beta', PLANES)
+def test_plot_fault_plane(beta, rake):
+    fault, bedding = PLANES[beta]
+    assert cutoff_pitch(fault, bedding) == pytest.approx(beta, abs=1e-9)
+
+    fig, ax = plot_fault_plane(fault, bedding, rake, show=False)
+
+    # FW cut-off line from the origin along the pitch, HW cut-off line shifted by the net slip
+    uv_cutoff, unit_vector = np.array(UNIT[beta]), np.array(UNIT[rake])
+    lines = next(c for c in ax.collections if isinstance(c, LineCollection))
+    fw_line, hw_line = lines.get_segments()[1], lines.get_segments()[3]
+    np.testing.assert_allclose(fw_line, [(0, 0), uv_cutoff], atol=1e-12)
+    np.testing.assert_allclose(hw_line, [unit_vector, unit_vector + uv_cutoff], atol=1e-12)
+
+    slip = ax.collections[0]
+    np.testing.assert_allclose((slip.U[0], slip.V[0]), unit_vector, atol=1e-12)
@@ -0,0 +1,32 @@
+"""
+_geom_compile.py
+
+Ahead-of-time compilation of the section_map geometry with Numba.
+
+Builds the extension module utils/_geom_native from the functions in _geom_numba.py, so that
+section_map does not pay the JIT compilation cost on the first call. Run once after installing
+Numba and a C compiler, from the project folder:
+
+    python -m utils._geom_compile
+
+Project: Fault Slip and Separation Explorer Tool
+Author: Marta Magán Lobo
+Date: 2022
+
+"""
+
+import os
+from numba.pycc import CC
+from utils import _geom_numba
+
+cc = CC('_geom_native')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+@cc.export('compute_all', _geom_numba.CORE_SIGNATURE)
+def compute_all(fault_dip, fault_dip_direction, bedding_dip, bedding_dip_direction,
+                net_slip_rake, net_slip_value, out):
+    _geom_numba.compute_all(fault_dip, fault_dip_direction, bedding_dip, bedding_dip_direction,
+                            net_slip_rake, net_slip_value, out)
+
+if __name__ == '__main__':
+    cc.compile()
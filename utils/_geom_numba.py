@@ -0,0 +1,235 @@
+"""
+_geom_numba.py
+
+Scalar version of the geometry used by section_map, compiled with Numba when it is installed.
+
+The functions mirror those in geometry.py but work on plain floats and tuples, so that the whole
+chain from plane orientations to 2D lines runs in a single compiled call. Without Numba they are
+ordinary Python functions.
+
+Project: Fault Slip and Separation Explorer Tool
+Author: Marta Magán Lobo
+Date: 2022
+
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+# Results packed by compute_all, as consecutive (x, y) pairs in this order
+FIELDS = ('fw', 'hw', 'fwm', 'hwm', 'rf', 'rfw', 'rhw', 'rfm', 'rfwm', 'rhwm', 'normal')
+N_OUT = 2 * len(FIELDS)
+
+# Signature of compute_all: six floats in, packed results written to a contiguous float64 array
+CORE_SIGNATURE = 'void(f8, f8, f8, f8, f8, f8, f8[::1])'
+
+@njit(cache=True, error_model='numpy')
+def normal_vector(dip, dip_direction):
+    """
+    Calculates the unit normal vector of a plane from its dip and dip direction in degrees.
+    """
+    # Avoid infinite values: nudge dip directions of 90 and 270, whose normal has no y component
+    if abs(math.sin(math.radians(dip_direction - 90))) < 1e-9:
+        dip_direction += 0.00001
+
+    # Direction vector of the plane
+    dd90 = math.radians(dip_direction - 90)
+    u0, u1 = math.sin(dd90), math.cos(dd90)
+
+    # Dip vector of the plane
+    dd = math.radians(dip_direction)
+    v0, v1, v2 = math.sin(dd), math.cos(dd), -math.tan(math.radians(dip))
+
+    # Cross product of v and u (u has no vertical component)
+    n0 = -v2 * u1
+    n1 = v2 * u0
+    n2 = v0 * u1 - v1 * u0
+
+    inv = 1.0 / math.sqrt(n0 * n0 + n1 * n1 + n2 * n2)
+    return (n0 * inv, n1 * inv, n2 * inv)
+
+@njit(cache=True, error_model='numpy')
+def net_slip_vector(dip, dip_direction, rake):
+    """
+    Calculates the unit vector of the net slip from its rake on the fault plane, in degrees.
+    """
+    s = math.radians(dip_direction - 90)
+    sin_s, cos_s = math.sin(s), math.cos(s)
+    d = math.radians(dip)
+    r = math.radians(rake)
+    along_strike = math.cos(r)
+    down_dip = math.sin(r)
+
+    # cos(rake) * strike vector + sin(rake) * down-dip vector
+    return (along_strike * sin_s + down_dip * math.cos(d) * cos_s,
+            along_strike * cos_s - down_dip * math.cos(d) * sin_s,
+            -down_dip * math.sin(d))
+
+@njit(cache=True, error_model='numpy')
+def plane_equation(n, P):
+    """
+    Calculates the coefficients (A, B, C, D) of the plane with normal n through the point P.
+    """
+    D = -n[0] * P[0] - n[1] * P[1] - n[2] * P[2]
+    return (n[0], n[1], n[2], D)
+
+@njit(cache=True, error_model='numpy')
+def solve2x2(a11, a12, a21, a22, b1, b2):
+    """
+    Solves the system [[a11, a12], [a21, a22]] * X = [b1, b2] with Cramer's rule.
+
+    Returns NaN when the system cannot be solved (planes are parallel or coincident). Nothing is
+    printed here, since it may run on several threads at once; section_map reports it instead.
+    """
+    det = a11 * a22 - a12 * a21
+    if det == 0:
+        return (math.nan, math.nan)
+    return ((b1 * a22 - b2 * a12) / det, (a11 * b2 - a21 * b1) / det)
+
+@njit(cache=True, error_model='numpy')
+def cross(a, b):
+    """
+    Cross product of two 3-element tuples.
+    """
+    return (a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0])
+
+@njit(cache=True, error_model='numpy')
+def section_point(P1, P2):
+    """
+    Point (for z=0) of the intersection line of two planes. Its direction is cross(P1, P2).
+    """
+    x, y = solve2x2(P1[0], P1[1], P2[0], P2[1], P1[3], P2[3])
+    return (x, y, 0.0)
+
+@njit(cache=True, error_model='numpy')
+def map_point(P1, P2):
+    """
+    Point (for y=0) of the intersection line of two planes. Its direction is cross(P1, P2).
+    """
+    x, z = solve2x2(P1[0], P1[2], P2[0], P2[2], P1[3], P2[3])
+    return (x, 0.0, z)
+
+@njit(cache=True, error_model='numpy')
+def lineEquation3Dto2D(A, v, i, j, k):
+    """
+    Slope and intercept of the 3D line (A, v) in the 2D reference system (i, j) normal to k.
+    """
+    a1 = i[0] * A[0] + i[1] * A[1] + i[2] * A[2]
+    a2 = j[0] * A[0] + j[1] * A[1] + j[2] * A[2]
+
+    vp = cross(k, v)
+    p1 = i[0] * vp[0] + i[1] * vp[1] + i[2] * vp[2]
+    p2 = j[0] * vp[0] + j[1] * vp[1] + j[2] * vp[2]
+
+    return (p1 / p2, (a1 * p1 + a2 * p2) / p2)
+
+@njit(cache=True, error_model='numpy')
+def cal_intersection(a1, b1, a2, b2):
+    """
+    Intersection point of the lines y = a1 * x + b1 and y = a2 * x + b2.
+    """
+    return ((b2 - b1) / (a1 - a2), a1 * (b2 - b1) / (a1 - a2) + b1)
+
+@njit(cache=True, error_model='numpy')
+def compute_all(fault_dip, fault_dip_direction, bedding_dip, bedding_dip_direction,
+                net_slip_rake, net_slip_value, out):
+    """
+    Geometry of section_map for a single scenario.
+
+    Writes the N_OUT values of the (x, y) pairs listed in FIELDS, which have the same meaning as the
+    keys returned by section_map, into the float64 array out.
+    """
+    O = (0.0, 0.0, 0.0)
+
+    nf = normal_vector(fault_dip, fault_dip_direction)
+    nb = normal_vector(bedding_dip, bedding_dip_direction)
+
+    # Unit vector in the direction of the net slip
+    u_ns = net_slip_vector(fault_dip, fault_dip_direction, net_slip_rake)
+
+    # Normal vector of a plane orthogonal to the fault plane
+    s = math.radians(fault_dip_direction - 90)
+    ns = (math.sin(s), math.cos(s), 0.0)
+
+    pf = plane_equation(nf, O)
+    pfw = plane_equation(nb, O)
+
+    # Apply net-slip
+    a = -net_slip_value
+    phw = plane_equation(nb, (a * u_ns[0], a * u_ns[1], a * u_ns[2]))
+
+    ps = plane_equation(ns, O)
+
+    # Intersection with the section. The bedding planes on both blocks are parallel, so their
+    # intersections share the direction
+    vr_fault_sec = cross(pf, ps)
+    vr_bed_sec = cross(pfw, ps)
+
+    j = (0.0, 0.0, 1.0)
+    k = ns
+    i = cross(j, k)
+    rf = lineEquation3Dto2D(section_point(pf, ps), vr_fault_sec, i, j, k)
+    rfw = lineEquation3Dto2D(section_point(pfw, ps), vr_bed_sec, i, j, k)
+    rhw = lineEquation3Dto2D(section_point(phw, ps), vr_bed_sec, i, j, k)
+
+    fw = cal_intersection(rf[0], rf[1], rfw[0], rfw[1])
+    hw = cal_intersection(rf[0], rf[1], rhw[0], rhw[1])
+
+    # Intersection with map
+    ph = (0.0, 0.0, 1.0, 0.0)
+    vr_fault_map = cross(pf, ph)
+    vr_bed_map = cross(pfw, ph)
+
+    j = (0.0, 1.0, 0.0)
+    k = (0.0, 0.0, 1.0)
+    i = (1.0, 0.0, 0.0)
+    rfm = lineEquation3Dto2D(map_point(pf, ph), vr_fault_map, i, j, k)
+    rfwm = lineEquation3Dto2D(map_point(pfw, ph), vr_bed_map, i, j, k)
+    rhwm = lineEquation3Dto2D(map_point(phw, ph), vr_bed_map, i, j, k)
+
+    fwm = cal_intersection(-rfm[0], rfm[1], -rfwm[0], rfwm[1])
+    hwm = cal_intersection(-rfm[0], rfm[1], -rhwm[0], rhwm[1])
+
+    pairs = (fw, hw, fwm, hwm, rf, rfw, rhw, rfm, rfwm, rhwm, (nf[0], nf[1]))
+    for n in range(len(pairs)):
+        out[2 * n] = pairs[n][0]
+        out[2 * n + 1] = pairs[n][1]
+
+@njit(parallel=True, cache=True, error_model='numpy')
+def compute_all_batched(fault_dip, fault_dip_direction, bedding_dip, bedding_dip_direction,
+                        net_slip_rake, net_slip_value, out):
+    """
+    Runs compute_all for every scenario of the (N,) input arrays, writing row n of the (N, N_OUT)
+    array out. Rows are independent, so they are computed in parallel.
+    """
+    for n in prange(fault_dip.shape[0]):
+        compute_all(fault_dip[n], fault_dip_direction[n], bedding_dip[n], bedding_dip_direction[n],
+                    net_slip_rake[n], net_slip_value[n], out[n])
+
+def warmup(batched: bool = False):
+    """
+    Compiles compute_all for CORE_SIGNATURE, or loads it from the on-disk cache, so that the first
+    single scenario section_map call does not wait for Numba. Does nothing when Numba is not installed.
+
+    With batched=True, compute_all_batched is also run on a one-row float64 batch, which covers the
+    first call with array inputs. This starts Numba's worker threads, and if they are started from a
+    daemon thread the interpreter hangs on exit, so only use it from the main thread.
+    """
+    if not HAVE_NUMBA:
+        return
+    compute_all.compile(CORE_SIGNATURE)
+    if batched:
+        row = np.zeros(1)
+        compute_all_batched(row, row, row, row, row, row, np.empty((1, N_OUT)))
@@ -1,62 +1,175 @@
-import math
+import functools
+import operator
 from typing import Tuple, Union
-import mplstereonet
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-from utils.geometry import cal_intersection, normal_vector, lineEquation3Dto2D, plane_equation, plane_intersectionMap, plane_intersectionSection, apply_netslip
-
-
-def section_map(fault: Tuple[Union[int, float], Union[int, float]], 
-                bedding: Tuple[Union[int, float], Union[int, float]], 
-                net_slip_rake: Union[int, float], 
-                net_slip_value: Union[int, float]):
+from utils._geom_numba import HAVE_NUMBA, N_OUT, compute_all_batched
+try:
+    # Ahead-of-time compiled core, built with python -m utils._geom_compile
+    from utils._geom_native import compute_all
+    HAVE_NATIVE = True
+except ImportError:
+    from utils._geom_numba import compute_all
+    HAVE_NATIVE = False
+from utils.geometry import cal_intersection, normal_vector, lineEquation3Dto2D, net_slip_vector, plane_equation, plane_intersectionMap, plane_intersectionSection, apply_netslip
+
+ArrayLike = Union[int, float, np.ndarray]
+
+# x values of the lines plotted in section and map
+XS = np.arange(-20, 20, dtype=np.float64)
+XM = np.arange(-50, 50, dtype=np.float64)
+XS.setflags(write=False)
+XM.setflags(write=False)
+
+# Points dropped from the footwall and hangingwall segments in map, keyed by the sign of the fault
+# normal x component and by the bedding dip direction (0, 180) or its relation to the fault one
+# ('<', '>'). Each rule is (fw_axis, fw_drop, hw_axis, hw_drop): footwall points with
+# fw_drop(point[fw_axis], 0) and hangingwall points with hw_drop(point[hw_axis], hwm[hw_axis])
+# are removed.
+_MAP_FILTER = {
+    (1, 0): (1, operator.lt, 0, operator.lt),
+    (1, 180): (1, operator.gt, 0, operator.lt),
+    (1, '<'): (1, operator.lt, 1, operator.gt),
+    (1, '>'): (1, operator.gt, 1, operator.lt),
+    (-1, 0): (1, operator.gt, 0, operator.gt),
+    (-1, 180): (1, operator.lt, 0, operator.gt),
+    (-1, '<'): (1, operator.gt, 1, operator.lt),
+    (-1, '>'): (1, operator.lt, 1, operator.gt),
+}
+
+# Figure and artists of plot_section_map, see _section_map_artists
+_SECTION_MAP_ARTISTS = {}
+
+
+def section_map(fault: Tuple[ArrayLike, ArrayLike], 
+                bedding: Tuple[ArrayLike, ArrayLike], 
+                net_slip_rake: ArrayLike, 
+                net_slip_value: ArrayLike):
     """
-    Plots the map and cross-section of the intersection between a fault and bedding plane with given net slip parameters.
+    Calculates the map and cross-section of the intersection between a fault and bedding plane with given net slip parameters.
+
+    Every parameter may be a number or an array of shape (N,), in which case all the scenarios are
+    evaluated at once and nothing is plotted. For a single scenario the separations are printed and
+    the section and map are plotted with plot_section_map.
 
     Args:
         fault (tuple): Fault plane parameters [dip, dip direction].
         bedding (tuple): Bedding plane parameters [dip, dip direction].
-        net_slip_rake (float): Rake of the net slip.
-        net_slip_value (float): Magnitude of the net slip.
+        net_slip_rake (float / np.ndarray): Rake of the net slip.
+        net_slip_value (float / np.ndarray): Magnitude of the net slip.
 
     Returns:
-        None
+        dict: Intersection points 'fw', 'hw' (section) and 'fwm', 'hwm' (map), shape (..., 2);
+              line coefficients [slope, intercept] 'rf', 'rfw', 'rhw' (section) and 'rfm', 'rfwm', 'rhwm' (map),
+              shape (..., 2); fault normal in map 'normal', shape (..., 2); 'dip_separation' and
+              'strike_separation', shape (...); and the input 'fault' and 'bedding'.
+    """
+    fault_dip, fault_dd = (np.asarray(a, dtype=float) for a in fault)
+    bedding_dip, bedding_dd = (np.asarray(a, dtype=float) for a in bedding)
+    net_slip_rake = np.asarray(net_slip_rake, dtype=float)
+    net_slip_value = np.asarray(net_slip_value, dtype=float)
+
+    inputs = (fault_dip, fault_dd, bedding_dip, bedding_dd, net_slip_rake, net_slip_value)
+    if all(np.ndim(a) == 0 for a in inputs):
+        # Single scenario: run the compiled scalar core, cached for repeated menu selections
+        geometry = _section_map_scalar(*(float(a) for a in inputs)).reshape(-1, 2)
+    elif HAVE_NUMBA:
+        geometry = _section_map_batched(*inputs)
+    else:
+        # The NumPy geometry reports unsolvable systems itself
+        geometry = None
+        fw, hw, fwm, hwm, rf, rfw, rhw, rfm, rfwm, rhwm, normal = _section_map_arrays(*inputs)
+    if geometry is not None:
+        # The compiled core leaves NaN in the line coefficients where a system could not be solved
+        if np.isnan(geometry[4:10]).any():
+            print("The system of equations cannot be solved, planes may be parallel or coincident.")
+        fw, hw, fwm, hwm, rf, rfw, rhw, rfm, rfwm, rhwm, normal = geometry
+
+    results = {
+        'fault': fault, 'bedding': bedding,
+        'fw': fw, 'hw': hw, 'fwm': fwm, 'hwm': hwm,
+        'rf': rf, 'rfw': rfw, 'rhw': rhw, 'rfm': rfm, 'rfwm': rfwm, 'rhwm': rhwm,
+        'normal': normal,
+        'dip_separation': np.hypot(fw[..., 0] - hw[..., 0], fw[..., 1] - hw[..., 1]),
+        'strike_separation': np.hypot(fwm[..., 0] - hwm[..., 0], fwm[..., 1] - hwm[..., 1]),
+    }
+
+    if results['dip_separation'].ndim == 0:
+        print(f"Dip separation: {results['dip_separation']:.2f}")
+        print(f"Strike separation: {results['strike_separation']:.2f}")
+        plot_section_map(results)
+
+    return results
+
+
+@functools.lru_cache(maxsize=256)
+def _section_map_scalar(fault_dip: float, fault_dd: float,
+                        bedding_dip: float, bedding_dd: float,
+                        net_slip_rake: float, net_slip_value: float):
     """
-    # Avoid infinite values
-    if bedding[1] == 90:
-        bedding[1] = 90.00001
-    if fault[1] == 90:
-        fault[1] = 90.00001
+    Geometry of section_map for a single scenario, memoized on its inputs.
+
+    Returns:
+        np.ndarray: Read-only packed (x, y) pairs of (fw, hw, fwm, hwm, rf, rfw, rhw, rfm, rfwm, rhwm, normal),
+                    see section_map and utils._geom_numba.FIELDS.
+    """
+    out = np.empty(N_OUT)
+    compute_all(fault_dip, fault_dd, bedding_dip, bedding_dd, net_slip_rake, net_slip_value, out)
+    out.setflags(write=False)
+    return out
+
+
+def _section_map_batched(*inputs: np.ndarray):
+    """
+    Geometry of section_map for a batch of scenarios, evaluated in parallel by the compiled core.
+
+    Args:
+        inputs (np.ndarray): fault_dip, fault_dd, bedding_dip, bedding_dd, net_slip_rake and
+                             net_slip_value, broadcast against each other.
+
+    Returns:
+        np.ndarray: (fw, hw, fwm, hwm, rf, rfw, rhw, rfm, rfwm, rhwm, normal) stacked along the first
+                    axis, each of shape (..., 2), see section_map.
+    """
+    shape = np.broadcast_shapes(*(np.shape(a) for a in inputs))
+    # Writable contiguous copies, so that every call matches the signature compiled by warmup
+    columns = [np.broadcast_to(a, shape).flatten() for a in inputs]
+
+    out = np.empty((len(columns[0]), N_OUT))
+    compute_all_batched(*columns, out)
+
+    return np.moveaxis(out.reshape(shape + (N_OUT // 2, 2)), -2, 0)
 
+
+def _section_map_arrays(fault_dip: np.ndarray, fault_dd: np.ndarray,
+                        bedding_dip: np.ndarray, bedding_dd: np.ndarray,
+                        net_slip_rake: np.ndarray, net_slip_value: np.ndarray):
+    """
+    Geometry of section_map for a batch of scenarios, evaluated with NumPy.
+
+    Args:
+        fault_dip, fault_dd (np.ndarray): Fault plane dip and dip direction.
+        bedding_dip, bedding_dd (np.ndarray): Bedding plane dip and dip direction.
+        net_slip_rake (np.ndarray): Rake of the net slip.
+        net_slip_value (np.ndarray): Magnitude of the net slip.
+
+    Returns:
+        tuple: (fw, hw, fwm, hwm, rf, rfw, rhw, rfm, rfwm, rhwm, normal), see section_map.
+    """
     # Origin
-    O = [0, 0, 0]
+    O = np.zeros(3)
 
     # Normal vector of fault plane
-    nf = normal_vector(fault)
+    nf = normal_vector((fault_dip, fault_dd))
 
     # Normal vector of bedding plane
-    nb = normal_vector(bedding)
-
-    # Adjust rake if necessary
-    if net_slip_rake >= 180 and net_slip_rake < 360:
-        rake = (net_slip_rake - 180)
-    else:
-        rake = net_slip_rake
-
-    # Calculate net slip vector
-    lon, lat = mplstereonet.rake(fault[1] - 90, fault[0], rake)
-    pb_netslip = mplstereonet.geographic2plunge_bearing(lon, lat)
-    netslip = [math.sin(math.radians(pb_netslip[1])), math.cos(math.radians(pb_netslip[1])), -math.tan(math.radians(pb_netslip[0]))]
+    nb = normal_vector((bedding_dip, bedding_dd))
 
     # Unit vector in the direction of the net slip
-    v = np.array(netslip)
-    if net_slip_rake >= 180:
-        v = -v
-    u_ns = v / np.linalg.norm(v)
+    u_ns = net_slip_vector((fault_dip, fault_dd), net_slip_rake)
 
     # Normal vector of a plane orthogonal to the fault plane
-    ns = [math.sin(math.radians(fault[1] - 90)), math.cos(math.radians(fault[1] - 90)), 0]
+    ns = np.stack((np.sin(np.deg2rad(fault_dd - 90)), np.cos(np.deg2rad(fault_dd - 90)), np.zeros_like(fault_dd)), axis=-1)
 
     # Fault plane equation
     pf = plane_equation(nf, O)
@@ -72,75 +185,127 @@ def section_map(fault: Tuple[Union[int, float], Union[int, float]],
     # Plane equation of the section
     ps = plane_equation(ns, O)
 
-    # Intersection with the section
-    IF = plane_intersectionSection(pf, ps)
-    IFW = plane_intersectionSection(pfw, ps)
-    IHW = plane_intersectionSection(phw, ps)
+    # Fault and bedding planes on both blocks stacked along a new first axis, so that their
+    # intersections are solved at once. They are broadcast first, since only some inputs may be
+    # arrays (e.g. pf follows the fault and phw the net slip)
+    planes = np.stack(np.broadcast_arrays(pf, pfw, phw))
+
+    # Intersection with the section of the fault and the bedding on both blocks
+    vr, Pp = plane_intersectionSection(planes, ps)
 
     # Change the reference system from 3D to 2D
-    j = [0, 0, 1]
+    j = np.array([0, 0, 1])
     k = ns
     i = np.cross(j, k)
-    rf = lineEquation3Dto2D(IF[1], IF[0], i, j, k)
-    rfw = lineEquation3Dto2D(IFW[1], IFW[0], i, j, k)      
-    rhw = lineEquation3Dto2D(IHW[1], IHW[0], i, j, k)
+    rf, rfw, rhw = lineEquation3Dto2D(Pp, vr, i, j, k)
 
     # Intersection points between fault and bedding on the footwall and hangingwall
-    fw = cal_intersection(rf[0], rf[1], rfw[0], rfw[1])
-    hw = cal_intersection(rf[0], rf[1], rhw[0], rhw[1])
-
-    # x, y values to plot in section
-    xf = np.arange(-20, 20, 1)
-    xfw = np.arange(-20, fw[0] + 1, 1)
-    xhw = np.arange(hw[0], 20, 1)
-
-    yf = rf[0] * xf + rf[1]
-    yfw = rfw[0] * xfw + rfw[1]
-    yhw = rhw[0] * xhw + rhw[1]
+    fw = np.stack(cal_intersection(rf[..., 0], rf[..., 1], rfw[..., 0], rfw[..., 1]), axis=-1)
+    hw = np.stack(cal_intersection(rf[..., 0], rf[..., 1], rhw[..., 0], rhw[..., 1]), axis=-1)
 
     # Normal vector to horizontal plane (map)
     uf = [0, 0, 1]
     ph = plane_equation(uf, O)
 
-    # Intersection with map
-    HIF = plane_intersectionMap(pf, ph)
-    HIFW = plane_intersectionMap(pfw, ph)
-    HIHW = plane_intersectionMap(phw, ph)
+    # Intersection with map, for the three planes at once
+    vr, Pp = plane_intersectionMap(planes, ph)
 
     # Change the reference system from 3D to 2D
-    j = [0, 1, 0]
-    k = [0, 0, 1]
-    i = [1, 0, 0]
-    rfm = lineEquation3Dto2D(HIF[1], HIF[0], i, j, k)
-    rfwm = lineEquation3Dto2D(HIFW[1], HIFW[0], i, j, k)
-    rhwm = lineEquation3Dto2D(HIHW[1], HIHW[0], i, j, k)
+    j = np.array([0, 1, 0])
+    k = np.array([0, 0, 1])
+    i = np.array([1, 0, 0])
+    rfm, rfwm, rhwm = lineEquation3Dto2D(Pp, vr, i, j, k)
 
     # Intersection points between fault and bedding on the footwall and hangingwall in map
-    fwm = cal_intersection(-rfm[0], rfm[1], -rfwm[0], rfwm[1])
-    hwm = cal_intersection(-rfm[0], rfm[1], -rhwm[0], rhwm[1])
+    fwm = np.stack(cal_intersection(-rfm[..., 0], rfm[..., 1], -rfwm[..., 0], rfwm[..., 1]), axis=-1)
+    hwm = np.stack(cal_intersection(-rfm[..., 0], rfm[..., 1], -rhwm[..., 0], rhwm[..., 1]), axis=-1)
 
     # Normal vector of fault plane in 2D
-    x = np.dot(i, nf)
-    y = np.dot(j, nf)
+    normal = np.stack((np.sum(i * nf, axis=-1), np.sum(j * nf, axis=-1)), axis=-1)
+    normal = np.broadcast_to(normal, fw.shape)
 
-    # x, y values to plot in section and map
-    xfm = np.arange(-50, 50, 1)
-    xfwm = np.arange(-50, 50, 1)
-    xhwm = np.arange(-50, 50, 1)
+    return (fw, hw, fwm, hwm, rf, rfw, rhw, rfm, rfwm, rhwm, normal)
 
-    yfm = -rfm[0] * xfm + rfm[1]
-    yfwm = -rfwm[0] * xfwm + rfwm[1]
-    yhwm = -rhwm[0] * xhwm + rhwm[1]
 
-    # For plotting block segments in map
-    vfw = np.vstack((xfwm, yfwm)).T
-    vhw = np.vstack((xhwm, yhwm)).T
+def _section_map_artists():
+    """
+    Returns the figure, axes and artists drawn by plot_section_map.
 
-    df_fw = pd.DataFrame(vfw)
-    df_hw = pd.DataFrame(vhw)
+    They are created empty on the first call and kept in _SECTION_MAP_ARTISTS, so that later calls
+    only update their data. A new figure is created if the previous one has been closed.
+
+    Returns:
+        dict: Figure 'fig', axes 'ax1' (section) and 'ax2' (map), and the artists of both axes.
+    """
+    fig = _SECTION_MAP_ARTISTS.get('fig')
+    if fig is not None and plt.fignum_exists(fig.number):
+        return _SECTION_MAP_ARTISTS
 
-    print(f"Dip separation: {round(math.dist(fw, hw), 2)}")
-    print(f"Strike separation: {round(math.dist(fwm, hwm), 2)}")
+    fig, (ax1, ax2) = plt.subplots(1, 2)
+    ax1.set_aspect('equal', adjustable='box')
+    ax2.set_aspect('equal', adjustable='box')
+
+    _SECTION_MAP_ARTISTS.update({
+        'fig': fig, 'ax1': ax1, 'ax2': ax2,
+        'fault_label': ax1.text(0, 0, '', size='large'),
+        'fault': ax1.plot([], [], color='#ff0004')[0],
+        'footwall': ax1.plot([], [], color='#0100ff')[0],
+        'hangingwall': ax1.plot([], [], color='#0100ff')[0],
+        'hangingwall_point': ax1.scatter([], [], marker='.', color='#0100ff', label='point'),
+        'north': ax2.text(0, 0, 'N \u2191', size='x-large'),
+        'strike': ax2.text(10, -10, '\u251c', size='x-large'),
+        'fault_map': ax2.plot([], [], color='#ff0004')[0],
+        'footwall_map': ax2.plot([], [], color='#0100ff')[0],
+        'hangingwall_map': ax2.plot([], [], color='#0100ff')[0],
+        'normal': ax2.quiver(0, 0, 0, 0, units='xy', scale=1, color='#ff0004'),
+        'hangingwall_point_map': ax2.scatter([], [], marker='.', color='#0100ff', label='point'),
+    })
+
+    for ax in (ax1, ax2):
+        ax.spines['right'].set_visible(False)
+        ax.spines['top'].set_visible(False)
+
+    return _SECTION_MAP_ARTISTS
+
+
+def plot_section_map(results: dict):
+    """
+    Plots the map and cross-section computed by section_map for a single scenario.
+
+    Args:
+        results (dict): Output of section_map for scalar inputs.
+
+    Returns:
+        None
+    """
+    fault, bedding = results['fault'], results['bedding']
+    fw, hw, hwm = results['fw'], results['hw'], results['hwm']
+    rf, rfw, rhw = results['rf'], results['rfw'], results['rhw']
+    rfm, rfwm, rhwm = results['rfm'], results['rfwm'], results['rhwm']
+    x, y = results['normal']
+
+    # x, y values to plot in section
+    xf = XS
+    xfw = np.arange(-20, fw[0] + 1, 1)
+    xhw = np.arange(hw[0], 20, 1)
+
+    yf = rf[0] * xf + rf[1]
+    yfw = rfw[0] * xfw + rfw[1]
+    yhw = rhw[0] * xhw + rhw[1]
+
+    # x, y values to plot in map: fault, footwall and hangingwall lines share the same x values
+    slopes = -np.array((rfm[0], rfwm[0], rhwm[0]))
+    intercepts = np.array((rfm[1], rfwm[1], rhwm[1]))
+    xfm = XM
+    yfm, yfwm, yhwm = slopes[:, np.newaxis] * XM + intercepts[:, np.newaxis]
+
+    # For plotting block segments in map
+    vfw = np.column_stack((XM, yfwm))
+    vhw = np.column_stack((XM, yhwm))
+
+    # Points of each segment kept in map
+    keep_fw = np.ones(vfw.shape[0], dtype=bool)
+    keep_hw = np.ones(vhw.shape[0], dtype=bool)
 
     bed = bedding[1]
     if bed > 180:
@@ -150,72 +315,55 @@ def section_map(fault: Tuple[Union[int, float], Union[int, float]],
         f = f - 180
 
     # Filter segments based on bedding and fault angles
-    if x > 0:
-        if bed == 0:
-            df_fw = df_fw.drop(df_fw[df_fw[1] < 0].index)
-            df_hw = df_hw.drop(df_hw[df_hw[0] < hwm[0]].index)
-        elif bed == 180:
-            df_fw = df_fw.drop(df_fw[df_fw[1] > 0].index)
-            df_hw = df_hw.drop(df_hw[df_hw[0] < hwm[0]].index)
-        elif bed < f:
-            df_fw = df_fw.drop(df_fw[df_fw[1] < 0].index)
-            df_hw = df_hw.drop(df_hw[df_hw[1] > hwm[1]].index)
-        elif bed > f:
-            df_fw = df_fw.drop(df_fw[df_fw[1] > 0].index)
-            df_hw = df_hw.drop(df_hw[df_hw[1] < hwm[1]].index)       
-    elif x < 0:
-        if bed == 0:
-            df_fw = df_fw.drop(df_fw[df_fw[1] > 0].index)
-            df_hw = df_hw.drop(df_hw[df_hw[0] > hwm[0]].index)
-        elif bed == 180:
-            df_fw = df_fw.drop(df_fw[df_fw[1] < 0].index)
-            df_hw = df_hw.drop(df_hw[df_hw[0] > hwm[0]].index)
-        elif bed < f:
-            df_fw = df_fw.drop(df_fw[df_fw[1] > 0].index)
-            df_hw = df_hw.drop(df_hw[df_hw[1] < hwm[1]].index)         
-        elif bed > f:  
-            df_fw = df_fw.drop(df_fw[df_fw[1] < 0].index)
-            df_hw = df_hw.drop(df_hw[df_hw[1] > hwm[1]].index)
-
-    fwm_aux = df_fw.to_numpy()
-    b, c = np.split(fwm_aux, 2, axis=1)
-
-    hwm_aux = df_hw.to_numpy()
-    d, e = np.split(hwm_aux, 2, axis=1)
-
-    # Plot section and map
-    fig, (ax1, ax2) = plt.subplots(1, 2)
-    ax1.set_aspect('equal', adjustable='box')
-    if fault[1] == 90.00001:
-        fault[1] = 90
-    ax1.text(0, rf[0] * (-15) + rf[1], str(fault[1]) + '\u2192', size='large')
+    side = 1 if x > 0 else -1 if x < 0 else 0
+    case = bed if bed in (0, 180) else '<' if bed < f else '>' if bed > f else '='
+    rule = _MAP_FILTER.get((side, case))
+    if rule is not None:
+        fw_axis, fw_drop, hw_axis, hw_drop = rule
+        keep_fw[fw_drop(vfw[:, fw_axis], 0)] = False
+        keep_hw[hw_drop(vhw[:, hw_axis], hwm[hw_axis])] = False
 
-    ax1.plot(xf, yf, color='#ff0004')
-    ax1.plot(xfw, yfw, color='#0100ff')
-    ax1.plot(xhw, yhw, color='#0100ff')
-    ax1.scatter(hw[0], hw[1], marker='.', color='#0100ff', label='point')
+    b, c = vfw[keep_fw, 0], vfw[keep_fw, 1]
+    d, e = vhw[keep_hw, 0], vhw[keep_hw, 1]
+
+    # Plot section and map, reusing the figure of a previous call while it is open
+    artists = _section_map_artists()
+    fig, ax1, ax2 = artists['fig'], artists['ax1'], artists['ax2']
+
+    # The data is computed in float64 and handed to Matplotlib in float32, enough for display
+    f32 = functools.partial(np.asarray, dtype=np.float32)
+
+    artists['fault_label'].set_position((0, rf[0] * (-15) + rf[1]))
+    artists['fault_label'].set_text(str(fault[1]) + '\u2192')
+
+    artists['fault'].set_data(f32(xf), f32(yf))
+    artists['footwall'].set_data(f32(xfw), f32(yfw))
+    artists['hangingwall'].set_data(f32(xhw), f32(yhw))
+    artists['hangingwall_point'].set_offsets(f32([hw]))
 
-    ax2.set_aspect('equal', adjustable='box')
     if bedding[1] >= 270 or 90 < bedding[1] <= 180:
-        ax2.text(-50, 40, 'N \u2191', size='x-large')
+        artists['north'].set_position((-50, 40))
     else:
-        ax2.text(40, 40, 'N \u2191', size='x-large')
-    ax2.text(10, -10, '\u251c', size='x-large', rotation=-bedding[1] + 90)
-
-    ax2.plot(xfm, yfm, color='#ff0004')
-    ax2.plot(b, c, color='#0100ff')
-    ax2.plot(d, e, color='#0100ff')
+        artists['north'].set_position((40, 40))
+    artists['strike'].set_rotation(-bedding[1] + 90)
 
-    ax2.quiver(0, 0, 10 * x, 10 * y, units='xy', scale=1, color='#ff0004')
-    ax2.scatter(hwm[0], hwm[1], marker='.', color='#0100ff', label='point')
+    artists['fault_map'].set_data(f32(xfm), f32(yfm))
+    artists['footwall_map'].set_data(f32(b), f32(c))
+    artists['hangingwall_map'].set_data(f32(d), f32(e))
 
-    ax1.spines['right'].set_visible(False)
-    ax1.spines['top'].set_visible(False)  
+    artists['normal'].set_UVC(10 * x, 10 * y)
+    artists['hangingwall_point_map'].set_offsets(f32([hwm]))
 
-    ax2.spines['right'].set_visible(False)
-    ax2.spines['top'].set_visible(False)
+    # relim only counts lines, so add the points of the scatters and the quiver as well
+    ax1.relim()
+    ax1.update_datalim(f32([hw]))
+    ax2.relim()
+    ax2.update_datalim(f32([hwm, (0, 0)]))
+    for ax in (ax1, ax2):
+        ax.autoscale_view()
+    fig.canvas.draw_idle()
 
     # Show the plot
     plt.show()
 
-    fig.savefig('map-section.png', transparent=True)
\ No newline at end of file
+    fig.savefig('map-section.png', transparent=True)
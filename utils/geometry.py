@@ -3,17 +3,26 @@ geometry.py
 
 Module containing geometric calculations for fault and bedding plane analysis.
 
+All functions accept either single values or arrays with a leading batch axis, so that a whole
+parameter sweep can be evaluated in one pass. Vectors are stored along the last axis, i.e. points
+and direction vectors have shape (..., 3) and plane equations have shape (..., 4).
+
 Project: Fault Slip and Separation Explorer Tool
 Author: Marta Magán Lobo
 Date: 2022
 
 """
 
-import math
 from typing import List, Tuple, Union
 import numpy as np
 
-def normal_vector(plane: Tuple[Union[int, float], Union[int, float]]):
+ArrayLike = Union[int, float, np.ndarray]
+
+# Check the inputs of every function. Off by default, since the checks cost more than the
+# calculations they guard; set to True while debugging.
+_DEBUG = False
+
+def normal_vector(plane: Tuple[ArrayLike, ArrayLike]):
     """
     Calculates the normal vector of a given plane in terms of its direction and angle of dip.
 
@@ -21,36 +30,85 @@ def normal_vector(plane: Tuple[Union[int, float], Union[int, float]]):
        plane (tuple): a tuple of two elements [dip, dip_direction] where.
             dip is the dip angle in degrees and 
             dip_direction is the dip direction in degrees from north.
+            Both elements may be numbers or arrays of shape (N,).
 
     Returns:
-        np.ndarray: a unit normal vector of the plane.
+        np.ndarray: a unit normal vector of the plane, shape (..., 3).
     """
     # Input validation
-    if not (isinstance(plane, (list, tuple)) and len(plane) == 2 and 
-            all(isinstance(x, (int, float)) for x in plane)):
-        raise ValueError("El parámetro 'plane' debe ser una lista o tupla con dos números (dip, dip_direction).")
+    if _DEBUG:
+        if not (isinstance(plane, (list, tuple)) and len(plane) == 2 and
+                all(np.issubdtype(np.asarray(x).dtype, np.number) for x in plane)):
+            raise ValueError("El parámetro 'plane' debe ser una lista o tupla con dos números (dip, dip_direction).")
+
+    dip, dip_direction = np.broadcast_arrays(np.asarray(plane[0], dtype=float),
+                                             np.asarray(plane[1], dtype=float))
 
-    dip, dip_direction = plane
+    # Avoid infinite values: nudge dip directions of 90 and 270, whose normal has no y component
+    dip_direction = np.where(np.abs(np.sin(np.deg2rad(dip_direction - 90))) < 1e-9,
+                             dip_direction + 0.00001, dip_direction)
 
     # Direction vector of the plane
-    u = [math.sin(math.radians(dip_direction - 90)), math.cos(math.radians(dip_direction - 90)), 0]
-    
+    dd90 = np.deg2rad(dip_direction - 90)
+    u0, u1 = np.sin(dd90), np.cos(dd90)
+
     # Dip vector of the plane
-    v = [math.sin(math.radians(dip_direction)), math.cos(math.radians(dip_direction)), -math.tan(math.radians(dip))]
-    
-    # Normal vector of the plane using the cross product of u and v
-    n = np.cross(v, u)
-    
+    dd = np.deg2rad(dip_direction)
+    v0, v1, v2 = np.sin(dd), np.cos(dd), -np.tan(np.deg2rad(dip))
+
+    # Normal vector of the plane using the cross product of v and u (u has no vertical component)
+    n0 = -v2 * u1
+    n1 = v2 * u0
+    n2 = v0 * u1 - v1 * u0
+
     # Unit vector
-    u_ns = n / np.linalg.norm(n)
-    
+    inv = 1.0 / np.sqrt(n0 * n0 + n1 * n1 + n2 * n2)
+    u_ns = np.empty(dip.shape + (3,))
+    u_ns[..., 0] = n0 * inv
+    u_ns[..., 1] = n1 * inv
+    u_ns[..., 2] = n2 * inv
+
+    return u_ns
+
+def net_slip_vector(fault: Tuple[ArrayLike, ArrayLike],
+                    rake: ArrayLike):
+    """
+    Calculates the unit vector of the net slip from its rake on the fault plane.
+
+    The rake is measured on the fault plane from the strike direction (dip direction - 90) towards
+    the dip direction, so rakes between 180 and 360 point upwards.
+
+    Args:
+        fault (tuple): Fault plane parameters [dip, dip direction], numbers or arrays of shape (N,).
+        rake (int / float / np.ndarray): Rake of the net slip in degrees.
+
+    Returns:
+        np.ndarray: a unit vector in the direction of the net slip, shape (..., 3).
+    """
+    dip, dip_direction, rake = np.broadcast_arrays(np.asarray(fault[0], dtype=float),
+                                                   np.asarray(fault[1], dtype=float),
+                                                   np.asarray(rake, dtype=float))
+
+    s = np.deg2rad(dip_direction - 90)
+    sin_s, cos_s = np.sin(s), np.cos(s)
+    d = np.deg2rad(dip)
+    r = np.deg2rad(rake)
+    along_strike = np.cos(r)
+    down_dip = np.sin(r)
+
+    # cos(rake) * strike vector + sin(rake) * down-dip vector
+    u_ns = np.empty(dip.shape + (3,))
+    u_ns[..., 0] = along_strike * sin_s + down_dip * np.cos(d) * cos_s
+    u_ns[..., 1] = along_strike * cos_s - down_dip * np.cos(d) * sin_s
+    u_ns[..., 2] = -down_dip * np.sin(d)
+
     return u_ns
 
-def lineEquation3Dto2D (A: List[Union[int, float]],
-                        v: List[Union[int, float]],
-                        i: List[Union[int, float]],
-                        j: List[Union[int, float]],
-                        k: List[Union[int, float]]):
+def lineEquation3Dto2D (A: List[ArrayLike],
+                        v: List[ArrayLike],
+                        i: List[ArrayLike],
+                        j: List[ArrayLike],
+                        k: List[ArrayLike]):
     """
     Calculates the 2D line equation parameters (slope and intercept) from a 3D line.
 
@@ -62,22 +120,34 @@ def lineEquation3Dto2D (A: List[Union[int, float]],
         k (list): Normal vector to the 2D plane.
 
     Returns:
-        list: A list containing the slope (m) and intercept (a) of the line in the 2D plane.
+        np.ndarray: The slope (m) and intercept (a) of the line in the 2D plane, shape (..., 2).
     """
+    # Broadcast against each other, since a direction may be shared by points of another shape
+    A, v, i, j, k = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (A, v, i, j, k)))
+
     # Validate input dimensions
-    if not (len(A) == len(v) == len(i) == len(j) == len(k) == 3):
-        raise ValueError("All input vectors must have exactly 3 elements.")
+    if _DEBUG:
+        if not (A.shape[-1] == v.shape[-1] == i.shape[-1] == j.shape[-1] == k.shape[-1] == 3):
+            raise ValueError("All input vectors must have exactly 3 elements.")
     
+    A0, A1, A2 = A[..., 0], A[..., 1], A[..., 2]
+    v0, v1, v2 = v[..., 0], v[..., 1], v[..., 2]
+    i0, i1, i2 = i[..., 0], i[..., 1], i[..., 2]
+    j0, j1, j2 = j[..., 0], j[..., 1], j[..., 2]
+    k0, k1, k2 = k[..., 0], k[..., 1], k[..., 2]
+
     # Projection of point A onto the i and j basis vectors
-    a1=np.dot(i,A)
-    a2=np.dot(j,A)
+    a1 = i0 * A0 + i1 * A1 + i2 * A2
+    a2 = j0 * A0 + j1 * A1 + j2 * A2
 
     # Vector perpendicular to both k and v (lying in the 2D plane)
-    vp=np.cross(k,v)
+    vp0 = k1 * v2 - k2 * v1
+    vp1 = k2 * v0 - k0 * v2
+    vp2 = k0 * v1 - k1 * v0
 
     # Projection of vp onto the i and j basis vectors
-    p1=np.dot(i,vp)
-    p2=np.dot(j,vp)
+    p1 = i0 * vp0 + i1 * vp1 + i2 * vp2
+    p2 = j0 * vp0 + j1 * vp1 + j2 * vp2
 
     # Slope of the line in 2D  
     m=p1/p2
@@ -85,12 +155,12 @@ def lineEquation3Dto2D (A: List[Union[int, float]],
     # Intercept of the line in 2D
     a=(a1*p1+a2*p2)/p2
 
-    return [m,a]
+    return np.stack((m, a), axis=-1)
 
-def cal_intersection(a1: Union[int, float],
-                     b1: Union[int, float],
-                     a2: Union[int, float],
-                     b2: Union[int, float]):
+def cal_intersection(a1: ArrayLike,
+                     b1: ArrayLike,
+                     a2: ArrayLike,
+                     b2: ArrayLike):
     """
     Calculates the intersection point of two lines given by their slope-intercept form.
 
@@ -99,30 +169,28 @@ def cal_intersection(a1: Union[int, float],
     y = a2 * x + b2
 
     Args:
-        a1 (float): Slope of the first line.
-        b1 (float): Y-intercept of the first line.
-        a2 (float): Slope of the second line.
-        b2 (float): Y-intercept of the second line.
+        a1 (float / np.ndarray): Slope of the first line.
+        b1 (float / np.ndarray): Y-intercept of the first line.
+        a2 (float / np.ndarray): Slope of the second line.
+        b2 (float / np.ndarray): Y-intercept of the second line.
 
     Returns:
-        tuple: A tuple (x, y) representing the intersection point of the two lines,
-               or None if the lines are parallel and do not intersect.
+        tuple: A tuple (x, y) representing the intersection point of the two lines.
+               The coordinates are infinite or NaN where the lines are parallel.
     """
-    try:
+    a1, b1, a2, b2 = (np.asarray(x, dtype=float) for x in (a1, b1, a2, b2))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
         # Calculate the x-coordinate of the intersection point
         x = (b2-b1)/(a1-a2)
 
         # Calculate the y-coordinate of the intersection point
         y = a1*(b2-b1)/(a1-a2) + b1
 
-        return (x,y)
-    except ZeroDivisionError:
-        # Handle the case where the lines are parallel (a1 == a2)
-        print("The lines are parallel and do not intersect.")
-        return None
-    
-def plane_equation (n: List[Union[int, float]],
-                    P: List[Union[int, float]]):
+    return (x, y)
+
+def plane_equation (n: List[ArrayLike],
+                    P: List[ArrayLike]):
     """
     Calculates the coefficients of the plane equation given a normal vector and a point on the plane.
 
@@ -134,22 +202,50 @@ def plane_equation (n: List[Union[int, float]],
         P (list): A point on the plane [x0, y0, z0].
 
     Returns:
-        list: A list of coefficients [A, B, C, D] for the plane equation.
+        np.ndarray: The coefficients [A, B, C, D] of the plane equation, shape (..., 4).
     """
+    n, P = np.broadcast_arrays(np.asarray(n), np.asarray(P))
+
     # Validate inputs
-    if not (len(n) == len(P) == 3):
-        raise ValueError("The normal vector 'n' and point 'P' must both have exactly 3 elements.")
-    if not (all(isinstance(coord, (int, float)) for coord in n) and all(isinstance(coord, (int, float)) for coord in P)):
-        raise ValueError("All elements of 'n' and 'P' must be numeric values.")
+    if _DEBUG:
+        if not (n.shape[-1] == 3):
+            raise ValueError("The normal vector 'n' and point 'P' must both have exactly 3 elements.")
+        if not (np.issubdtype(n.dtype, np.number) and np.issubdtype(P.dtype, np.number)):
+            raise ValueError("All elements of 'n' and 'P' must be numeric values.")
      
     # Calculate the D coefficient using the point P
-    D = -n[0] * P[0] - n[1] * P[1] - n[2] * P[2]
+    D = -n[..., 0] * P[..., 0] - n[..., 1] * P[..., 1] - n[..., 2] * P[..., 2]
     
     # Return the plane equation coefficients [A, B, C, D]
-    return [n[0], n[1], n[2], D]
+    return np.concatenate((n, D[..., np.newaxis]), axis=-1)
+
+def _solve2x2(a11: ArrayLike, a12: ArrayLike,
+              a21: ArrayLike, a22: ArrayLike,
+              b1: ArrayLike, b2: ArrayLike):
+    """
+    Solves the 2x2 system of equations [[a11, a12], [a21, a22]] * X = [b1, b2] with Cramer's rule.
+
+    Args:
+        a11, a12, a21, a22 (float / np.ndarray): Coefficients of the system.
+        b1, b2 (float / np.ndarray): Right-hand side of the system.
+
+    Returns:
+        tuple: The two components of the solution. They are NaN or infinite where the system cannot be solved.
+    """
+    det = a11 * a22 - a12 * a21
+
+    if np.any(det == 0):
+        # If the determinant is zero, the system cannot be solved (planes are parallel or coincident)
+        print("The system of equations cannot be solved, planes may be parallel or coincident.")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x1 = (b1 * a22 - b2 * a12) / det
+        x2 = (a11 * b2 - a21 * b1) / det
 
-def plane_intersectionMap(P1: List[Union[int, float]],
-                       P2: List[Union[int, float]]):
+    return (x1, x2)
+
+def plane_intersectionMap(P1: List[ArrayLike],
+                          P2: List[ArrayLike]):
     """
     Calculates the intersection line of two planes given by their general equations.
 
@@ -165,17 +261,20 @@ def plane_intersectionMap(P1: List[Union[int, float]],
         list: A list containing the direction vector of the intersection line and a point on the line.
               Format: [direction_vector, point_on_line]
     """
+    P1, P2 = np.broadcast_arrays(np.asarray(P1), np.asarray(P2))
+
     # Validate inputs
-    if not (len(P1) == len(P2) == 4):
-        raise ValueError("Both input arrays must have exactly 4 elements.")
-    if not (all(isinstance(coord, (int, float)) for coord in P1) and all(isinstance(coord, (int, float)) for coord in P2)):
-        raise ValueError("All elements of P1 and P2 must be numeric values.")
+    if _DEBUG:
+        if not (P1.shape[-1] == 4):
+            raise ValueError("Both input arrays must have exactly 4 elements.")
+        if not (np.issubdtype(P1.dtype, np.number) and np.issubdtype(P2.dtype, np.number)):
+            raise ValueError("All elements of P1 and P2 must be numeric values.")
 
     # Normal vector of the first plane
-    n1 = [P1[0], P1[1], P1[2]]
+    n1 = P1[..., :3]
     
     # Normal vector of the second plane
-    n2 = [P2[0], P2[1], P2[2]]
+    n2 = P2[..., :3]
     
     # Direction vector of the intersection line of P1 and P2
     vr = np.cross(n1, n2)
@@ -184,22 +283,13 @@ def plane_intersectionMap(P1: List[Union[int, float]],
     # Equations for y=0:
     # A1*x + C1*z + D1 = 0
     # A2*x + C2*z + D2 = 0
-    A = np.array([[P1[0], P1[2]], [P2[0], P2[2]]])
-    B = np.array([P1[3], P2[3]])
-
-    if np.linalg.det(A) == 0:
-        # If the determinant is zero, the system cannot be solved (planes are parallel or coincident)
-        print("The system of equations cannot be solved, planes may be parallel or coincident.")
-        X = None
-    else:
-        # Solve the system of equations
-        X = np.linalg.inv(A).dot(B)
+    x, z = _solve2x2(P1[..., 0], P1[..., 2], P2[..., 0], P2[..., 2], P1[..., 3], P2[..., 3])
     
-    Pp = [X[0], 0, X[1]]
+    Pp = np.stack((x, np.zeros_like(x), z), axis=-1)
     return [vr, Pp]
 
-def plane_intersectionSection(P1: List[Union[int, float]],
-                              P2: List[Union[int, float]]):
+def plane_intersectionSection(P1: List[ArrayLike],
+                              P2: List[ArrayLike]):
     """
     Calculates the intersection line between a given plane and  by their general equations.
 
@@ -215,66 +305,63 @@ def plane_intersectionSection(P1: List[Union[int, float]],
         list: A list containing the direction vector of the intersection line and a point on the line.
               Format: [direction_vector, point_on_line]
     """
+    P1, P2 = np.broadcast_arrays(np.asarray(P1), np.asarray(P2))
+
     # Validate inputs
-    if not (len(P1) == len(P2) == 4):
-        raise ValueError("Both input arrays must have exactly 4 elements.")
-    if not (all(isinstance(coord, (int, float)) for coord in P1) and all(isinstance(coord, (int, float)) for coord in P2)):
-        raise ValueError("All elements of P1 and P2 must be numeric values.")
+    if _DEBUG:
+        if not (P1.shape[-1] == 4):
+            raise ValueError("Both input arrays must have exactly 4 elements.")
+        if not (np.issubdtype(P1.dtype, np.number) and np.issubdtype(P2.dtype, np.number)):
+            raise ValueError("All elements of P1 and P2 must be numeric values.")
 
     # Normal vector of the first plane
-    n1 = [P1[0], P1[1], P1[2]]
+    n1 = P1[..., :3]
     
     # Normal vector of the second plane
-    n2 = [P2[0], P2[1], P2[2]]
+    n2 = P2[..., :3]
     
     # Direction vector of the intersection line of P1 and P2
     vr = np.cross(n1, n2)
     
     # Initial point, solving equation system for z=0
-    # Equations for y=0:
-    # A1*x + C1*z + D1 = 0
-    # A2*x + C2*z + D2 = 0
-    A = np.array([[P1[0], P1[1]], [P2[0], P2[1]]])
-    B = np.array([P1[3], P2[3]])
-
-    if np.linalg.det(A) == 0:
-        # If the determinant is zero, the system cannot be solved (planes are parallel or coincident)
-        print("The system of equations cannot be solved, planes may be parallel or coincident.")
-        X = None
-    else:
-        # Solve the system of equations
-        X = np.linalg.inv(A).dot(B)
+    # Equations for z=0:
+    # A1*x + B1*y + D1 = 0
+    # A2*x + B2*y + D2 = 0
+    x, y = _solve2x2(P1[..., 0], P1[..., 1], P2[..., 0], P2[..., 1], P1[..., 3], P2[..., 3])
     
-    Pp = [X[0], X[1], 0]
+    Pp = np.stack((x, y, np.zeros_like(x)), axis=-1)
     return [vr, Pp]
 
-def apply_netslip(P: List[Union[int, float]],
-                  v: List[Union[int, float]],
-                  a: Union[int, float]):
+def apply_netslip(P: List[ArrayLike],
+                  v: List[ArrayLike],
+                  a: ArrayLike):
     """
     Applies the net slip to a point P based on a direction vector v and a scalar magnitude a.
 
     Args:
         P (list): The original point coordinates.
         v (list): The direction vector of the net-slip.
-        a (int / float): The magnitude of the net-slip.
+        a (int / float / np.ndarray): The magnitude of the net-slip.
 
     Returns:
         np.ndarray: The new coordinates of the point after applying the slip.
     """
+    a = np.asarray(a)
+
     # Validate inputs
-    if not isinstance(a, (int, float)):
-        raise ValueError("The magnitude 'a' must be a numeric value.")
-    if not (len(P) == len(v)):
-        raise ValueError("The point 'P' and direction vector 'v' must have the same length.")
+    if _DEBUG:
+        if not np.issubdtype(a.dtype, np.number):
+            raise ValueError("The magnitude 'a' must be a numeric value.")
+        if not (np.shape(P)[-1] == np.shape(v)[-1]):
+            raise ValueError("The point 'P' and direction vector 'v' must have the same length.")
     
     # Convert the direction vector v to a numpy array
-    u=np.array(v)
+    u=np.asarray(v)
 
     # Calculate the displacement by scaling the direction vector by the magnitude a
-    displacement = a * u
+    displacement = a[..., np.newaxis] * u
     
     # Add the displacement to the original point P to get the new point
     new_point = np.add(P, displacement)
     
-    return new_point
\ No newline at end of file
+    return new_point
@@ -8,114 +8,290 @@ Author: Marta Magán Lobo
 Date: 2022
 
 """
+import functools
 import math
-from typing import Tuple, Union
-import mplstereonet
+from typing import BinaryIO, Tuple, Union
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+from matplotlib.lines import Line2D
 import numpy as np
 
-def plot_dip_separation(fault: Tuple[Union[int, float], Union[int, float]], 
-                        bedding: Tuple[Union[int, float], Union[int, float]], 
-                        net_slip: Union[int, float]):
+# Static elements shared by the dip separation, strike separation and folds plots, built once on import
+# x coordinates of the ticks and the vertical guide lines
+_XCOORDS = (10, 45, 80, 100, 135, 170, 190, 225, 260, 280, 315, 350)
+_YTICKS = np.arange(0, 190, 45)
+# Vertical guide lines at _XCOORDS, spanning the whole y range
+_GUIDES = np.array([((xc, 0), (xc, 180)) for xc in _XCOORDS], dtype=float)
+
+# x coordinates for filling areas
+_X1 = np.linspace(180.0, 360.0, 19)
+_X2 = np.linspace(0.0, 180.0, 19)
+_X3 = np.array([0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 90, 90, 90, 90, 90, 90, 90, 90, 90])
+_X4 = np.array([90, 90, 90, 90, 90, 90, 90, 90, 90, 90, 100, 110, 120, 130, 140, 150, 160, 170, 180])
+_NEG180_X1 = -(180 - _X1)
+
+# Diagonal lines of no separation, joined into a single line with a NaN gap
+_DIAG_X = np.concatenate((_X1, [np.nan], _X2))
+_DIAG_Y = np.concatenate((_NEG180_X1, [np.nan], _X2))
+
+def _fill(x, y1, y2=0):
     """
-    Plotting function to visualize dip separation relationships based on fault and bedding orientations.
+    Vertices of the polygon between the curves (x, y1) and (x, y2), as filled by fill_between.
+    """
+    x = np.asarray(x, dtype=float)
+    y1, y2 = np.broadcast_to(y1, x.shape), np.broadcast_to(y2, x.shape)
+    polygon = np.concatenate((np.column_stack((x, y1)), np.column_stack((x, y2))[::-1]))
+
+    # Drop repeated vertices and those in the middle of straight segments, which do not change the
+    # outline. Matplotlib does not simplify collections, so they would otherwise reach the output.
+    polygon = polygon[np.concatenate(([True], np.any(np.diff(polygon, axis=0) != 0, axis=1)))]
+    d = np.diff(polygon, axis=0)
+    turn = d[:-1, 0] * d[1:, 1] - d[:-1, 1] * d[1:, 0]
+    return polygon[np.concatenate(([True], turn != 0, [True]))]
+
+# Filled areas of each plot, grouped by color
+_DIP_YELLOW = (_fill(_NEG180_X1, _X2, 90), _fill(_X1, _X3), _fill(_X1, _X4, 180))
+_DIP_ORANGE = (_fill(_X1, _X2, 90), _fill(_NEG180_X1, _X3), _fill(_NEG180_X1, _X4, 180))
+_STRIKE_YELLOW = (_fill(_X1, _X2), _fill(_NEG180_X1, _X2, 180))
+_STRIKE_ORANGE = (_fill(_X1, _X2, 180), _fill(_NEG180_X1, _X2))
+_FOLDS_YELLOW = (_fill(_X1, 360), _fill(_X2, 360))
+
+for _a in (_YTICKS, _GUIDES, _X1, _X2, _X3, _X4, _NEG180_X1, _DIAG_X, _DIAG_Y,
+           *_DIP_YELLOW, *_DIP_ORANGE, *_STRIKE_YELLOW, *_STRIKE_ORANGE, *_FOLDS_YELLOW):
+    _a.setflags(write=False)
+del _a
+
+# Filled areas (polygons, color, label), label of the diagonal lines, y axis label, horizontal
+# position of the legend and whether the diagonal lines go first in the legend, for each plot
+_SEPARATION_PLOTS = {
+    'dip': (((_DIP_YELLOW, 'yellow', 'REVERSE DIP SEPARATION'),
+             (_DIP_ORANGE, 'orange', 'NORMAL DIP SEPARATION')),
+            'NO DIP SEPARATION', "Pitch of the cut-off lines", 0.5, False),
+    'strike': (((_STRIKE_YELLOW, 'yellow', 'LEFT STRIKE SEPARATION'),
+                (_STRIKE_ORANGE, 'orange', 'RIGHT STRIKE SEPARATION')),
+               'NO STRIKE SEPARATION', "Pitch of the cut-off lines", 0.5, False),
+    'folds': (((_FOLDS_YELLOW, 'yellow', 'ALTERNATION OF APPARENTLY REVERSE AND NORMAL FAULT SEGMENTS'),),
+              'CONSTANT FAULT CHARACTER', "Pitch of axial plane cut-off line", 0.46, True),
+}
+
+# Text annotations (x, y, text, rotation) and their font
+_TEXT_ANN = (
+    (2, 97, 'Left-lateral', 90),
+    (25, 97, 'Left-lateral normal', 90),
+    (60, 97, 'Normal left-lateral', 90),
+    (87, 97, 'Normal', 90),
+    (115, 20, 'Normal right-lateral', 90),
+    (150, 20, 'Right-lateral normal', 90),
+    (172, 46, 'Right-lateral', 90),
+    (182, 97, 'Right-lateral', 90),
+    (205, 97, 'Right-lateral reverse', 90),
+    (240, 97, 'Reverse right-lateral', 90),
+    (267, 97, 'Reverse', 90),
+    (295, 22, 'Reverse left-lateral', 90),
+    (330, 22, 'Left-lateral reverse', 90),
+    (352, 51, 'Left-lateral', 90)
+)
+_FP_SMALL = FontProperties(size='small')
+
+def _subplots(show: bool, **fig_kw):
+    """
+    Creates a figure with a single axes. Figures that are not shown are drawn on an Agg canvas
+    outside pyplot, so no GUI window is created for them.
+    """
+    if show:
+        return plt.subplots(1, 1, **fig_kw)
+    fig = Figure(**fig_kw)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+def _draw_base(show: bool,
+               fills: Tuple[Tuple[Tuple[np.ndarray, ...], str, str], ...],
+               line_label: str,
+               ylabel: str,
+               legend_x: float,
+               line_first: bool):
+    """
+    Draws the static part of the dip separation, strike separation and folds plots.
 
     Args:
-    - fault (tuple): Fault plane parameters [dip, dip direction].
-    - bedding (tuple): Bedding plane parameters [dip, dip direction].
-    - net_slip: Amount of net slip on the fault.
+    - show: Create the figure through pyplot to be displayed. If False, it is drawn off-screen.
+    - fills, line_label, ylabel, legend_x, line_first: Description of the plot, see _SEPARATION_PLOTS.
 
     Returns:
-    - None (displays a plot).
-
-    This function generates a plot that shows different dip separation relationships 
-    based on the given fault and bedding orientations and the net slip.
-
-    Note: Requires matplotlib and numpy libraries.
+    - fig, ax1: The figure and its axes.
     """
     
-    # Calculate cutoff pitch based on fault and bedding angles
-    cutoff = cutoff_pitch(fault, bedding)
-    
     # Create the plot
-    fig, ax1 = plt.subplots(1, 1, sharex=True, figsize=(8, 6))
+    fig, ax1 = _subplots(show, figsize=(8, 6))
     ax1.set_aspect('equal', adjustable='box')  # Set aspect ratio
     
     # Customize ticks and secondary x-axis
-    plt.xticks([10, 45, 80, 100, 135, 170, 190, 225, 260, 280, 315, 350])
-    plt.yticks(np.arange(0, 190, 45))
+    ax1.set_xticks(_XCOORDS)
+    ax1.set_yticks(_YTICKS)
     secax = ax1.secondary_xaxis('top')
     secax.set_xticks([0, 90, 180, 270, 360])
     
     # Set limits and draw reference lines
-    plt.xlim(0, 360)
-    plt.ylim(0, 180)
-    plt.axhline(90, color="black", linestyle='dashed')
-    plt.axvline(180, color="black", linestyle='dashed')
+    ax1.set_xlim(0, 360)
+    ax1.set_ylim(0, 180)
+    ax1.axhline(90, color="black", linestyle='dashed')
+    ax1.axvline(180, color="black", linestyle='dashed')
     
-    # Define x coordinates for filling areas using numpy arrays
-    x1 = np.arange(180, 370, 10)
-    x2 = np.arange(0, 190, 10)
-    x3 = np.array([0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 90, 90, 90, 90, 90, 90, 90, 90, 90])
-    x4 = np.array([90, 90, 90, 90, 90, 90, 90, 90, 90, 90, 100, 110, 120, 130, 140, 150, 160, 170, 180])
-    
-    # Fill areas with different colors using numpy functions
-    ax1.fill_between(-(180 - x1), x2, 90, color='yellow', alpha=.2, label='REVERSE DIP SEPARATION')
-    ax1.fill_between(x1, x2, 90, color='orange', alpha=.2, label='NORMAL DIP SEPARATION')
-    ax1.fill_between(-(180 - x1), x3, color='orange', alpha=.2)
-    ax1.fill_between(x1, x3, color='yellow', alpha=.2)
-    ax1.fill_between(x1, x4, 180, color='yellow', alpha=.2)
-    ax1.fill_between(-(180 - x1), x4, 180, color='orange', alpha=.2)
+    # Fill areas with one collection per color
+    areas = [ax1.add_collection(PolyCollection(polygons, color=color, alpha=.2, label=label))
+             for polygons, color, label in fills]
     
     # Plot diagonal lines with a single call
-    ax1.plot(x1, -(180 - x1), color='#98ceff', zorder=6, linewidth=2, label='NO DIP SEPARATION')
-    ax1.plot(x2, x2, color='#98ceff', zorder=6, linewidth=2)
+    line, = ax1.plot(_DIAG_X, _DIAG_Y, color='#98ceff', zorder=6, linewidth=2, label=line_label)
     
     # Add legend with reduced calls
-    ax1.legend(loc='upper center', bbox_to_anchor=(0.5, -0.16), shadow=True, ncol=5, frameon=False, fontsize="small")
+    handles = [line, *areas] if line_first else [*areas, line]
+    ax1.legend(handles=handles, loc='upper center', bbox_to_anchor=(legend_x, -0.16), shadow=True, ncol=5, frameon=False, fontsize="small")
     
-    # Draw vertical lines at specific x-coordinates using a loop
-    xcoords = [10, 45, 80, 100, 135, 170, 190, 225, 260, 280, 315, 350]
-    for xc in xcoords:
-        ax1.axvline(x=xc, c='black', linewidth=0.2)
+    # Draw vertical lines at specific x-coordinates as a single collection
+    ax1.add_collection(LineCollection(_GUIDES, colors='black', linewidths=0.2, zorder=2))
     
     # Add text annotations with reduced calls
-    text_annotations = [
-        (2, 97, 'Left-lateral', 90),
-        (25, 97, 'Left-lateral normal', 90),
-        (60, 97, 'Normal left-lateral', 90),
-        (87, 97, 'Normal', 90),
-        (115, 20, 'Normal right-lateral', 90),
-        (150, 20, 'Right-lateral normal', 90),
-        (172, 46, 'Right-lateral', 90),
-        (182, 97, 'Right-lateral', 90),
-        (205, 97, 'Right-lateral reverse', 90),
-        (240, 97, 'Reverse right-lateral', 90),
-        (267, 97, 'Reverse', 90),
-        (295, 22, 'Reverse left-lateral', 90),
-        (330, 22, 'Left-lateral reverse', 90),
-        (352, 51, 'Left-lateral', 90)
-    ]
-    
-    for x, y, text, rotation in text_annotations:
-        ax1.text(x, y, text, size='small', rotation=rotation)
+    add_text = ax1.text
+    for x, y, text, rotation in _TEXT_ANN:
+        add_text(x, y, text, fontproperties=_FP_SMALL, rotation=rotation)
     
     # Set axis labels
-    plt.ylabel("Pitch of the cut-off lines", size='large')
-    plt.xlabel("Pitch of the net-slip", size='large')
+    ax1.set_ylabel(ylabel, size='large')
+    ax1.set_xlabel("Pitch of the net-slip", size='large')
+
+    return fig, ax1
+
+def _plot_base(net_slip: Union[int, float],
+               cutoff: Union[int, float],
+               kind: str,
+               show: bool,
+               save_path: Union[str, BinaryIO, None]):
+    """
+    Common plotting function of the dip separation, strike separation and folds plots.
+
+    Args:
+    - net_slip: Pitch of the net slip.
+    - cutoff: Pitch of the cut-off line.
+    - kind: 'dip', 'strike' or 'folds', see _SEPARATION_PLOTS.
+    - show: Display the plot. If False, it is drawn off-screen.
+    - save_path: File name or binary file object to save the plot to. Not saved if None.
+
+    Returns:
+    - fig, ax: The figure and axes of the plot, to be further customized or saved by the caller.
+    """
+    fig, ax1 = _draw_base(show, *_SEPARATION_PLOTS[kind])
     
     # Plot the data points
-    plt.plot(net_slip, cutoff, 'o', zorder=7)
+    ax1.scatter([net_slip], [cutoff], s=36, zorder=7)
     
     # Show the plot
-    plt.show()
+    if show:
+        plt.show()
     
-    # Save the figure as png (optional)
-    fig.savefig('dip_separation.png', transparent=True)
+    # Save the figure (optional)
+    if save_path is not None:
+        fig.savefig(save_path, transparent=True)
+
+    # Release the figure from pyplot once it is no longer displayed. Off-screen figures are not
+    # registered with pyplot, and in interactive mode the window stays open.
+    if show and not plt.isinteractive():
+        plt.close(fig)
+
+    return fig, ax1
+
+class SeparationPlot:
+    """
+    Dip separation, strike separation or folds plot for repeated updates of the data point.
+
+    The static part of the plot is drawn once and kept as a background image, so update only
+    redraws the point and blits it onto the canvas.
+
+    Args:
+    - kind: 'dip', 'strike' or 'folds'.
+    - show: Display the plot in a window. If False, it is drawn off-screen.
+    """
+
+    def __init__(self, kind: str = 'dip', show: bool = True):
+        self.fig, self.ax = _draw_base(show, *_SEPARATION_PLOTS[kind])
+        self._canvas = self.fig.canvas
+
+        # The point is animated, so full draws leave it out of the background
+        self._point = self.ax.scatter([], [], s=36, zorder=7, animated=True)
+        self._background = None
+        self._canvas.mpl_connect('draw_event', self._on_draw)
+
+        if show:
+            plt.show(block=False)
+        self._canvas.draw()
+
+    def _on_draw(self, event):
+        """
+        Stores the background after every full draw (first draw, resize...) and redraws the point.
+        """
+        # Draws made by save include the point already
+        if not self._point.get_animated():
+            return
+        self._background = self._canvas.copy_from_bbox(self.fig.bbox)
+        self.ax.draw_artist(self._point)
+
+    def update(self, net_slip: Union[int, float], cutoff: Union[int, float]):
+        """
+        Moves the data point to (net_slip, cutoff).
+        """
+        self._point.set_offsets([[net_slip, cutoff]])
+        self._canvas.restore_region(self._background)
+        self.ax.draw_artist(self._point)
+        self._canvas.blit(self.fig.bbox)
+        self._canvas.flush_events()
+
+    def save(self, save_path: Union[str, BinaryIO]):
+        """
+        Saves the plot, including the data point, to a file name or binary file object.
+        """
+        self._point.set_animated(False)
+        try:
+            self.fig.savefig(save_path, transparent=True)
+        finally:
+            self._point.set_animated(True)
+
+def plot_dip_separation(fault: Tuple[Union[int, float], Union[int, float]], 
+                        bedding: Tuple[Union[int, float], Union[int, float]], 
+                        net_slip: Union[int, float],
+                        show: bool = True,
+                        save_path: Union[str, BinaryIO, None] = None):
+    """
+    Plotting function to visualize dip separation relationships based on fault and bedding orientations.
+
+    Args:
+    - fault (tuple): Fault plane parameters [dip, dip direction].
+    - bedding (tuple): Bedding plane parameters [dip, dip direction].
+    - net_slip: Amount of net slip on the fault.
+    - show: Display the plot. If False, it is drawn off-screen.
+    - save_path: File name or binary file object (e.g. io.BytesIO) to save the plot to. Not saved if None.
+
+    Returns:
+    - fig, ax: The figure and axes of the plot, to be further customized or saved by the caller.
+
+    This function generates a plot that shows different dip separation relationships 
+    based on the given fault and bedding orientations and the net slip.
+
+    Note: Requires matplotlib and numpy libraries.
+    """
+    
+    # Calculate cutoff pitch based on fault and bedding angles
+    cutoff = cutoff_pitch(tuple(fault), tuple(bedding))
+    
+    return _plot_base(net_slip, cutoff, 'dip', show, save_path)
 
 def plot_strike_separation(fault: Tuple[Union[int, float], Union[int, float]], 
                            bedding: Tuple[Union[int, float], Union[int, float]], 
-                           net_slip: Union[int, float]):
+                           net_slip: Union[int, float],
+                           show: bool = True,
+                           save_path: Union[str, BinaryIO, None] = None):
     """
     Plotting function to visualize strike separation relationships based on fault and bedding orientations.
 
@@ -123,9 +299,11 @@ def plot_strike_separation(fault: Tuple[Union[int, float], Union[int, float]],
     - fault: Angle of the fault plane (degrees).
     - bedding: Angle of the bedding plane (degrees).
     - net_slip: Amount of net slip on the fault.
+    - show: Display the plot. If False, it is drawn off-screen.
+    - save_path: File name or binary file object (e.g. io.BytesIO) to save the plot to. Not saved if None.
 
     Returns:
-    - None (displays a plot).
+    - fig, ax: The figure and axes of the plot, to be further customized or saved by the caller.
 
     This function generates a plot that shows different strike separation relationships 
     based on the given fault and bedding orientations and the net slip.
@@ -134,91 +312,25 @@ def plot_strike_separation(fault: Tuple[Union[int, float], Union[int, float]],
     """
     
     # Calculate cutoff pitch based on fault and bedding angles
-    cutoff = cutoff_pitch(fault, bedding)
-    
-    # Create the plot
-    fig, ax1 = plt.subplots(1, 1, sharex=True, figsize=(8, 6))
-    ax1.set_aspect('equal', adjustable='box')  # Set aspect ratio
-    
-    # Customize ticks and secondary x-axis
-    plt.xticks([10, 45, 80, 100, 135, 170, 190, 225, 260, 280, 315, 350])
-    plt.yticks(np.arange(0, 190, 45))
-    secax = ax1.secondary_xaxis('top')
-    secax.set_xticks([0, 90, 180, 270, 360])
-    
-    # Set limits and draw reference lines
-    plt.xlim(0, 360)
-    plt.ylim(0, 180)
-    plt.axhline(90, color="black", linestyle='dashed')
-    plt.axvline(180, color="black", linestyle='dashed')
-    
-    # Define x coordinates for filling areas using numpy arrays
-    x1 = np.arange(180, 370, 10)
-    x2 = np.arange(0, 190, 10)
-    
-    # Fill areas with different colors using numpy functions
-    ax1.fill_between(-(180 - x1), x2, color='orange', alpha=.2)
-    ax1.fill_between(x1, x2, color='yellow', alpha=.2, label='LEFT STRIKE SEPARATION')
-    ax1.fill_between(x1, x2, np.max(x2), color='orange', alpha=.2, label='RIGHT STRIKE SEPARATION')
-    ax1.fill_between(-(180 - x1), x2, np.max(x2), color='yellow', alpha=.2)
-    
-    # Plot diagonal lines with a single call
-    ax1.plot(x1, -(180 - x1), color='#98ceff', zorder=6, linewidth=2, label='NO STRIKE SEPARATION')
-    ax1.plot(x2, x2, color='#98ceff', zorder=6, linewidth=2)
-    
-    # Add legend with reduced calls
-    ax1.legend(loc='upper center', bbox_to_anchor=(0.5, -0.16), shadow=True, ncol=5, frameon=False, fontsize="small")
-    
-    # Draw vertical lines at specific x-coordinates using a loop
-    xcoords = [10, 45, 80, 100, 135, 170, 190, 225, 260, 280, 315, 350]
-    for xc in xcoords:
-        ax1.axvline(x=xc, c='black', linewidth=0.2)
+    cutoff = cutoff_pitch(tuple(fault), tuple(bedding))
     
-    # Add text annotations with reduced calls
-    text_annotations = [
-        (2, 97, 'Left-lateral', 90),
-        (25, 97, 'Left-lateral normal', 90),
-        (60, 97, 'Normal left-lateral', 90),
-        (87, 97, 'Normal', 90),
-        (115, 20, 'Normal right-lateral', 90),
-        (150, 20, 'Right-lateral normal', 90),
-        (172, 46, 'Right-lateral', 90),
-        (182, 97, 'Right-lateral', 90),
-        (205, 97, 'Right-lateral reverse', 90),
-        (240, 97, 'Reverse right-lateral', 90),
-        (267, 97, 'Reverse', 90),
-        (295, 22, 'Reverse left-lateral', 90),
-        (330, 22, 'Left-lateral reverse', 90),
-        (352, 51, 'Left-lateral', 90)
-    ]
-    
-    for x, y, text, rotation in text_annotations:
-        ax1.text(x, y, text, size='small', rotation=rotation)
-    
-    # Set axis labels
-    plt.ylabel("Pitch of the cut-off lines", size="large")
-    plt.xlabel("Pitch of the net-slip", size="large")
-    
-    # Plot the data points
-    plt.plot(net_slip, cutoff, 'o', zorder=7)
-    
-    # Show the plot
-    plt.show()
-    
-    # Save the figure as png (optional)
-    fig.savefig('strike_separation.png', transparent=True)
+    return _plot_base(net_slip, cutoff, 'strike', show, save_path)
     
 def plot_folds(net_slip: Union[int, float], 
-               cutoff: Union[int, float]):
+               cutoff: Union[int, float],
+               show: bool = True,
+               save_path: Union[str, BinaryIO, None] = None):
     """
     Plotting function to visualize fold relationships based on net slip and cutoff values.
 
     Args:
     - net_slip: Pitch of the net slip.
     - cutoff: Pitch of axial plane cut-off line.
+    - show: Display the plot. If False, it is drawn off-screen.
+    - save_path: File name or binary file object (e.g. io.BytesIO) to save the plot to. Not saved if None.
 
     Returns:
-    - None (displays a plot).
+    - fig, ax: The figure and axes of the plot, to be further customized or saved by the caller.
 
     This function generates a plot that shows different fold relationships 
     based on the net slip and cutoff values.
@@ -226,116 +338,71 @@ def plot_folds(net_slip: Union[int, float],
     Note: Requires matplotlib and numpy libraries.
     """
     
-    # Create the plot
-    fig, ax1 = plt.subplots(1, 1, sharex=True, figsize=(8, 6))
-    ax1.set_aspect('equal', adjustable='box')  # Set aspect ratio
-    
-    # Customize ticks and secondary x-axis
-    plt.xticks([10, 45, 80, 100, 135, 170, 190, 225, 260, 280, 315, 350])
-    plt.yticks(np.arange(0, 190, 45))
-    secax = ax1.secondary_xaxis('top')
-    secax.set_xticks([0, 90, 180, 270, 360])
-    
-    # Set limits and draw reference lines
-    plt.xlim(0, 360)
-    plt.ylim(0, 180)
-    plt.axhline(90, color="black", linestyle='dashed')
-    plt.axvline(180, color="black", linestyle='dashed')
-    
-    # Define x coordinates for filling areas using numpy arrays
-    x1 = np.arange(180, 370, 10)
-    x2 = np.arange(0, 190, 10)
-    
-    # Plot diagonal lines with a single call
-    ax1.plot(x1, -(180 - x1), color='#98ceff', zorder=6, linewidth=2, label='CONSTANT FAULT CHARACTER')
-    ax1.plot(x2, x2, color='#98ceff', zorder=6, linewidth=2)
-    
-    # Fill areas with different colors using numpy functions
-    ax1.fill_between(x1, 360, color='yellow', alpha=.2, label='ALTERNATION OF APPARENTLY REVERSE AND NORMAL FAULT SEGMENTS')
-    ax1.fill_between(x2, 360, color='yellow', alpha=.2)
-    
-    # Add legend with reduced calls
-    ax1.legend(loc='upper center', bbox_to_anchor=(0.46, -0.16), shadow=True, ncol=5, frameon=False, fontsize="small")
-    
-    # Draw vertical lines at specific x-coordinates using a loop
-    xcoords = [10, 45, 80, 100, 135, 170, 190, 225, 260, 280, 315, 350]
-    for xc in xcoords:
-        ax1.axvline(x=xc, c='black', linewidth=0.2)
-    
-    # Add text annotations with reduced calls
-    text_annotations = [
-        (2, 97, 'Left-lateral', 90),
-        (25, 97, 'Left-lateral normal', 90),
-        (60, 97, 'Normal left-lateral', 90),
-        (87, 97, 'Normal', 90),
-        (115, 20, 'Normal right-lateral', 90),
-        (150, 20, 'Right-lateral normal', 90),
-        (172, 46, 'Right-lateral', 90),
-        (182, 97, 'Right-lateral', 90),
-        (205, 97, 'Right-lateral reverse', 90),
-        (240, 97, 'Reverse right-lateral', 90),
-        (267, 97, 'Reverse', 90),
-        (295, 22, 'Reverse left-lateral', 90),
-        (330, 22, 'Left-lateral reverse', 90),
-        (352, 51, 'Left-lateral', 90)
-    ]
-    
-    for x, y, text, rotation in text_annotations:
-        ax1.text(x, y, text, size='small', rotation=rotation)
-    
-    # Set axis labels
-    plt.ylabel("Pitch of axial plane cut-off line", size="large")
-    plt.xlabel("Pitch of the net-slip", size="large")
-    
-    # Plot the data points
-    plt.plot(net_slip, cutoff, 'o', zorder=7)
-    
-    # Show the plot
-    plt.show()
-    
-    # Save the figure as png (optional)
-    fig.savefig('folds.png', transparent=True)
+    return _plot_base(net_slip, cutoff, 'folds', show, save_path)
 
+@functools.lru_cache(maxsize=256)
 def cutoff_pitch(fault: Tuple[Union[int, float], Union[int, float]], 
                  bedding: Tuple[Union[int, float], Union[int, float]]):
     """
     Calculates the pitch angle of the cutoff line on the fault plane.
 
+    Results are cached, so fault and bedding must be hashable (tuples, not lists).
+
     Args:
-    - fault: Tuple containing (strike, dip) of the fault plane in degrees.
-    - bedding: Tuple containing (strike, dip) of the bedding plane in degrees.
+    - fault: Tuple containing (dip, dip direction) of the fault plane in degrees.
+    - bedding: Tuple containing (dip, dip direction) of the bedding plane in degrees.
 
     Returns:
     - beta: Pitch angle of the cutoff line on the fault plane in degrees.
     """
 
-    # Calculate the intersection line between fault plane and bedding plane
-    cutoff_line = mplstereonet.plane_intersection(fault[1] - 90, fault[0], bedding[1] - 90, bedding[0])
+    fault_dip, fault_dd = math.radians(fault[0]), math.radians(fault[1])
+    bedding_dip, bedding_dd = math.radians(bedding[0]), math.radians(bedding[1])
+
+    # Upward normal vectors of the fault and bedding planes (x east, y north, z up)
+    nf = (math.sin(fault_dd) * math.sin(fault_dip), math.cos(fault_dd) * math.sin(fault_dip), math.cos(fault_dip))
+    nb = (math.sin(bedding_dd) * math.sin(bedding_dip), math.cos(bedding_dd) * math.sin(bedding_dip), math.cos(bedding_dip))
+
+    # Direction of the cutoff line, intersection of both planes
+    cutoff_line = (nf[1] * nb[2] - nf[2] * nb[1],
+                   nf[2] * nb[0] - nf[0] * nb[2],
+                   nf[0] * nb[1] - nf[1] * nb[0])
 
-    # Calculate the rake of the cutoff line on the fault plane
-    cutoff_rake = mplstereonet.azimuth2rake(fault[1] - 90, fault[0], cutoff_line[1])
+    # Components of the cutoff line along the strike (right-hand rule) and down the dip of the fault
+    along_strike = -math.cos(fault_dd) * cutoff_line[0] + math.sin(fault_dd) * cutoff_line[1]
+    down_dip = (math.cos(fault_dip) * (math.sin(fault_dd) * cutoff_line[0] + math.cos(fault_dd) * cutoff_line[1])
+                - math.sin(fault_dip) * cutoff_line[2])
 
-    # Adjust beta to be within [0, 180) degrees
-    if cutoff_rake < 0:
-        beta = 180 + cutoff_rake
-    else:
-        beta = cutoff_rake
+    # Pitch measured from the strike, within [0, 180) degrees whichever way the line points
+    beta = math.degrees(math.atan2(down_dip, along_strike)) % 180
 
     return beta
     
+def _unit(angle: Union[int, float]):
+    """
+    Unit vector on the fault plane view of a line with the given pitch in degrees, measured from
+    the strike (+x) downwards (-y): 0 -> (1, 0), 90 -> (0, -1), 180 -> (-1, 0), 270 -> (0, 1).
+    """
+    r = math.radians(angle)
+    return (math.cos(r), -math.sin(r))
+
 def plot_fault_plane(fault: Tuple[Union[int, float], Union[int, float]], 
                      bedding: Tuple[Union[int, float], Union[int, float]], 
-                     net_slip_rake: Union[int, float]):
+                     net_slip_rake: Union[int, float],
+                     show: bool = True,
+                     save_path: Union[str, BinaryIO, None] = None):
     """
     Plot the fault plane and its associated cut-off lines based on the given parameters.
 
     Args:
-    - fault: Tuple containing (strike, dip) of the fault plane in degrees.
-    - bedding: Tuple containing (strike, dip) of the bedding plane in degrees.
+    - fault: Tuple containing (dip, dip direction) of the fault plane in degrees.
+    - bedding: Tuple containing (dip, dip direction) of the bedding plane in degrees.
     - net_slip_rake: Rake angle (direction) of the net slip in degrees.
+    - show: Display the plot. If False, it is drawn off-screen.
+    - save_path: File name or binary file object (e.g. io.BytesIO) to save the plot to. Not saved if None.
 
     Returns:
-    - None (displays a plot).
+    - fig, ax: The figure and axes of the plot, to be further customized or saved by the caller.
 
     This function generates a plot showing the fault plane and its cut-off lines 
     (FW and HW) based on the provided orientation and net slip direction.
@@ -344,59 +411,44 @@ def plot_fault_plane(fault: Tuple[Union[int, float], Union[int, float]],
     """
 
     # Calculate the pitch angle of the cutoff line on the fault plane
-    beta = cutoff_pitch(fault, bedding)
-    tan_beta = math.tan(math.radians(beta))
-
-    # Determine unit vector of the cutoff line on the bedding plane
-    if 0 <= beta < 90:
-        v_cutoff = [1, -tan_beta]
-    elif 90 < beta <= 180:
-        v_cutoff = [-1, tan_beta]
-
-    v = np.array(v_cutoff)
-    uv_cutoff = v / np.linalg.norm(v)  # Unit vector of cutoff line direction
-
-    # Calculate the tangent of the net slip direction angle
-    tan_alfa = math.tan(math.radians(net_slip_rake))
-
-    # Determine unit vector of the net slip direction
-    if 0 <= net_slip_rake < 90:
-        v_netslip = [1, -tan_alfa]
-    elif 90 < net_slip_rake < 180:
-        v_netslip = [-1, tan_alfa]
-    elif 180 <= net_slip_rake < 270:
-        v_netslip = [-1, tan_alfa]
-    elif 270 < net_slip_rake <= 360:
-        v_netslip = [1, -tan_alfa]
-    elif net_slip_rake == 90:
-        v_netslip = [0, -1]
-    elif net_slip_rake == 270:
-        v_netslip = [0, 1]
-
-    vector = np.array(v_netslip)
-    unit_vector = vector / np.linalg.norm(vector)  # Unit vector of net slip direction
-
-    # Define coordinates for FW (Forward) and HW (Hinterland) cut-off lines
-    fw_x = [0, uv_cutoff[0]]
-    fw_y = [0, uv_cutoff[1]]
-
-    hw_x = [unit_vector[0], uv_cutoff[0] + unit_vector[0]]
-    hw_y = [unit_vector[1], uv_cutoff[1] + unit_vector[1]]
+    beta = cutoff_pitch(tuple(fault), tuple(bedding))
+
+    # Unit vectors of the cutoff line and the net slip direction on the fault plane
+    uv_cutoff = _unit(beta)
+    unit_vector = _unit(net_slip_rake)
+
+    # Segments of the FW (Forward) and HW (Hinterland) cut-off lines and their horizontal references
+    fw_end = (uv_cutoff[0], uv_cutoff[1])
+    hw_start = (unit_vector[0], unit_vector[1])
+    hw_end = (uv_cutoff[0] + unit_vector[0], uv_cutoff[1] + unit_vector[1])
+    segments = (((0, 0), (fw_end[0], 0)),
+                ((0, 0), fw_end),
+                (hw_start, (hw_end[0], hw_start[1])),
+                (hw_start, hw_end))
 
     # Create the plot
-    fig, ax = plt.subplots()
+    fig, ax = _subplots(show)
     ax.quiver(0, 0, unit_vector[0], unit_vector[1], units='xy', scale=1, color='green')  # Plot net slip direction
 
-    plt.plot(fw_x, [0, 0], color='black', linestyle='dashed')
-    plt.plot(fw_x, fw_y, label='FW cut-off line')  # Plot FW cut-off line
-    plt.plot(hw_x, [unit_vector[1], unit_vector[1]], color='black', linestyle='dashed')
-    plt.plot(hw_x, hw_y, label='HW cut-off line')  # Plot HW cut-off line
+    # Cut-off lines and references as a single collection
+    ax.add_collection(LineCollection(segments, colors=('black', 'C0', 'black', 'C1'),
+                                     linestyles=('dashed', 'solid', 'dashed', 'solid'), linewidths=1.5))
 
-    plt.gca().set_aspect('equal', adjustable='box')
-    plt.xlim(-3, 3)
-    plt.ylim(-3, 3)
-    plt.legend()
-    plt.show()
+    ax.set_aspect('equal', adjustable='box')
+    ax.set_xlim(-3, 3)
+    ax.set_ylim(-3, 3)
+    ax.legend(handles=(Line2D([], [], color='C0', label='FW cut-off line'),
+                       Line2D([], [], color='C1', label='HW cut-off line')))
+    if show:
+        plt.show()
     
-    # Save the figure as png (optional)
-    fig.savefig('fault-plane.png', transparent=True)
\ No newline at end of file
+    # Save the figure (optional)
+    if save_path is not None:
+        fig.savefig(save_path, transparent=True)
+
+    # Release the figure from pyplot once it is no longer displayed. Off-screen figures are not
+    # registered with pyplot, and in interactive mode the window stays open.
+    if show and not plt.isinteractive():
+        plt.close(fig)
+
+    return fig, ax